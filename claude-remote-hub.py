@@ -5,24 +5,50 @@ A lightweight web server that manages ttyd + tmux terminal sessions.
 """
 
 from typing import Optional
+import atexit
+import errno
+import functools
+import select
+import shlex
 import subprocess
 import os
 import sys
 import signal
+import threading
 import time
+import gzip
 import json
+import re
 import hashlib
 import shutil
 import socket
+import string
 import glob as _glob
 import platform as _platform
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from socketserver import ThreadingMixIn
 from urllib.parse import unquote, parse_qs, urlparse
-from datetime import datetime
 
 VERSION = "3.1.0"
 
+# Optional C JSON accelerator for the hot POST paths (every VK keystroke
+# parses a small dict). The stdlib fallback keeps the zero-dependency install.
+try:
+    import orjson
+
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_loads(data: bytes):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
 # ─── Platform Detection ─────────────────────────────────────────────────────
 
 PLATFORM = _platform.system().lower()  # 'darwin', 'linux', 'windows'
@@ -54,12 +80,25 @@ FONT_SIZE = int(os.environ.get("CLAUDE_FONT_SIZE", 11))
 DEV_ROOT = os.environ.get("CLAUDE_DEV_ROOT", os.path.expanduser("~/Projects"))
 INSTALL_DIR = os.environ.get("CLAUDE_REMOTE_HUB_DIR", os.path.expanduser("~/.claude-remote-hub"))
 
-IGNORED_DIRS = {".git", "node_modules", "__pycache__", "venv", ".venv", ".tox",
-                ".mypy_cache", ".pytest_cache", "dist", "build", ".next", ".nuxt"}
+IGNORED_DIRS = frozenset({".git", "node_modules", "__pycache__", "venv", ".venv", ".tox",
+                          ".mypy_cache", ".pytest_cache", "dist", "build", ".next", ".nuxt"})
+
+# Resolved once: realpath walks every path component and DEV_ROOT never
+# changes during the server's lifetime.
+_DEV_ROOT_REAL = os.path.realpath(DEV_ROOT)
+if not os.path.isdir(_DEV_ROOT_REAL):
+    _DEV_ROOT_REAL = os.path.expanduser("~")
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 _template_cache: dict[str, str] = {}
 
+# Install-dir paths used on request and session-start paths, joined once
+CERT_FILE = os.path.join(INSTALL_DIR, "hub.crt")
+KEY_FILE = os.path.join(INSTALL_DIR, "hub.key")
+ICON_FILE = os.path.join(INSTALL_DIR, "icon_chub.png")
+ICON_FALLBACK_FILE = os.path.join(SCRIPT_DIR, "icon_chub.png")
+TTYD_INDEX_FILE = os.path.join(INSTALL_DIR, "ttyd-index.html")
+
 # ─── Helpers ─────────────────────────────────────────────────────────────────
 
 
@@ -129,7 +168,7 @@ def _get_process_cwd(pid: int) -> Optional[str]:
         try:
             out = subprocess.check_output(
                 [lsof, "-a", "-p", str(pid), "-d", "cwd", "-Fn"],
-                text=True, stderr=subprocess.DEVNULL
+                text=True, stderr=subprocess.DEVNULL, close_fds=False
             )
             for line in out.strip().split("\n"):
                 if line.startswith("n") and line != "n":
@@ -171,127 +210,511 @@ def _find_latest_session_id(cwd: str) -> Optional[str]:
     return os.path.splitext(os.path.basename(latest))[0]
 
 
+@functools.lru_cache(maxsize=256)
 def port_for_name(name: str) -> int:
     """Generate a deterministic port (7700-7799) from a session name."""
-    h = int(hashlib.md5(name.encode()).hexdigest(), 16)
-    return BASE_PORT + (h % (MAX_PORT - BASE_PORT))
+    h = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return BASE_PORT + (int.from_bytes(h, "little") % (MAX_PORT - BASE_PORT))
 
 
 def _port_in_use_socket(port: int) -> bool:
     """Check if a port is in use via socket connection attempt."""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(0.5)
+        s.settimeout(0.2)
         return s.connect_ex(("127.0.0.1", port)) == 0
 
 
-def _get_listening_ports_lsof() -> set[int]:
-    """Get listening ports in 7700-7799 range using lsof (macOS/Linux)."""
+def _get_listening_ports_proc() -> Optional[set[int]]:
+    """Get listening ports in 7700-7799 range from /proc/net/tcp (Linux).
+
+    A single file read with no fork+exec. Returns None if /proc is unavailable
+    so callers can fall back to lsof/ss.
+    """
+    ports: set[int] = set()
+    readable = False
+    for path in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(path, "r") as f:
+                next(f)  # skip header
+                for line in f:
+                    parts = line.split()
+                    # Column 3 is the connection state; 0A = LISTEN
+                    if len(parts) < 4 or parts[3] != "0A":
+                        continue
+                    port = int(parts[1].rsplit(":", 1)[-1], 16)
+                    if BASE_PORT <= port <= MAX_PORT:
+                        ports.add(port)
+            readable = True
+        except (StopIteration, FileNotFoundError, PermissionError, OSError, ValueError):
+            continue
+    return ports if readable else None
+
+
+def _get_listening_ports_lsof() -> Optional[set[int]]:
+    """Get listening ports in 7700-7799 range using lsof (macOS/Linux).
+
+    Returns None if lsof is missing or failed, so callers can tell
+    "nothing is listening" apart from "backend unavailable".
+    """
     lsof = shutil.which("lsof")
     if not lsof:
-        return set()
+        return None
     try:
-        out = subprocess.check_output(
+        # bytes in, bytes out: lsof output is ASCII, skip the decode pass
+        proc = subprocess.run(
             [lsof, "-iTCP:7700-7799", "-sTCP:LISTEN", "-P", "-n"],
-            text=True, stderr=subprocess.DEVNULL
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, close_fds=False
         )
+        # lsof exits 1 when simply nothing matched; that is a valid
+        # empty answer, not a backend failure
+        if proc.returncode not in (0, 1):
+            return None
         ports: set[int] = set()
-        for line in out.strip().split("\n"):
-            if "LISTEN" in line:
+        for line in proc.stdout.strip().split(b"\n"):
+            if b"LISTEN" in line:
                 for part in line.split():
-                    if ":" in part and part.split(":")[-1].isdigit():
-                        ports.add(int(part.split(":")[-1]))
+                    tail = part.rsplit(b":", 1)[-1]
+                    if tail is not part and tail.isdigit():
+                        ports.add(int(tail))
         return ports
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return set()
+    except (FileNotFoundError, OSError):
+        return None
 
 
-def _get_listening_ports_ss() -> set[int]:
-    """Get listening ports in 7700-7799 range using ss (Linux)."""
+def _get_listening_ports_ss() -> Optional[set[int]]:
+    """Get listening ports in 7700-7799 range using ss (Linux).
+
+    Returns None if ss is missing or failed.
+    """
     ss = shutil.which("ss")
     if not ss:
-        return set()
+        return None
     try:
         out = subprocess.check_output(
-            [ss, "-tlnH"], text=True, stderr=subprocess.DEVNULL
+            [ss, "-tlnH"], stderr=subprocess.DEVNULL, close_fds=False
         )
         ports: set[int] = set()
-        for line in out.strip().split("\n"):
-            parts = line.split()
-            for part in parts:
-                if ":" in part:
-                    port_str = part.rsplit(":", 1)[-1]
+        for line in out.strip().split(b"\n"):
+            for part in line.split():
+                if b":" in part:
+                    port_str = part.rsplit(b":", 1)[-1]
                     if port_str.isdigit():
                         port = int(port_str)
                         if BASE_PORT <= port <= MAX_PORT:
                             ports.add(port)
         return ports
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return set()
+    except (subprocess.CalledProcessError, FileNotFoundError, OSError):
+        return None
 
 
-def get_ttyd_ports() -> set[int]:
-    """Return the set of ports where ttyd is currently listening."""
-    ports = _get_listening_ports_lsof()
-    if not ports and PLATFORM == "linux":
-        ports = _get_listening_ports_ss()
+def _get_listening_ports_netstat() -> Optional[set[int]]:
+    """Get listening ports in 7700-7799 range using netstat (macOS).
+
+    netstat reads the pcblist sysctl directly instead of walking every
+    process's fd table the way lsof does, so it answers in a few ms.
+    Returns None if netstat is missing or failed.
+    """
+    netstat = shutil.which("netstat")
+    if not netstat:
+        return None
+    try:
+        out = subprocess.check_output(
+            [netstat, "-anp", "tcp"], stderr=subprocess.DEVNULL,
+            close_fds=False
+        )
+        ports: set[int] = set()
+        for line in out.strip().split(b"\n"):
+            if b"LISTEN" not in line:
+                continue
+            parts = line.split()
+            if len(parts) < 4:
+                continue
+            # Local address is column 4; macOS uses a dot before the port
+            port_str = parts[3].rsplit(b".", 1)[-1]
+            if port_str.isdigit():
+                port = int(port_str)
+                if BASE_PORT <= port <= MAX_PORT:
+                    ports.add(port)
+        return ports
+    except (subprocess.CalledProcessError, FileNotFoundError, OSError):
+        return None
+
+
+def _get_listening_ports_scan() -> set[int]:
+    """Probe the whole ttyd range with concurrent non-blocking connects.
+
+    Last-resort fallback when neither /proc nor lsof/ss yields anything:
+    on loopback, refused connects fail immediately and the few that enter
+    EINPROGRESS settle within one select round, so the 100-port sweep
+    costs roughly one RTT instead of 100 sequential probes.
+    """
+    ports: set[int] = set()
+    pending: dict = {}
+    for port in range(BASE_PORT, MAX_PORT + 1):
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.setblocking(False)
+        err = s.connect_ex(("127.0.0.1", port))
+        if err == 0:
+            ports.add(port)
+            s.close()
+        elif err == errno.EINPROGRESS:
+            pending[s] = port
+        else:
+            s.close()
+    deadline = time.monotonic() + 0.25
+    while pending:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            break
+        _, writable, _ = select.select([], list(pending), [], timeout)
+        if not writable:
+            break
+        for s in writable:
+            port = pending.pop(s)
+            if s.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                ports.add(port)
+            s.close()
+    for s in pending:
+        s.close()
     return ports
 
 
+def get_ttyd_ports() -> set[int]:
+    """Return the set of ports where ttyd is currently listening.
+
+    Fastest backend per platform first: /proc then ss on Linux, netstat
+    on macOS; lsof only as a fallback, and a concurrent connect-scan as
+    the last resort. Every backend returns None when it is unavailable
+    and a set (possibly empty) when it answered, so the chain stops at
+    the first backend that actually answered — an empty dashboard does
+    not cascade into lsof forks and a 100-port sweep.
+    """
+    if PLATFORM == "linux":
+        backends = (_get_listening_ports_proc, _get_listening_ports_ss,
+                    _get_listening_ports_lsof)
+    elif PLATFORM == "darwin":
+        backends = (_get_listening_ports_netstat, _get_listening_ports_lsof)
+    else:
+        backends = (_get_listening_ports_lsof,)
+    for backend in backends:
+        ports = backend()
+        if ports is not None:
+            return ports
+    return _get_listening_ports_scan()
+
+
 def port_in_use(port: int) -> bool:
     """Check if a TCP port is currently in use."""
-    lsof = shutil.which("lsof")
-    if lsof:
-        r = subprocess.run([lsof, "-i", f":{port}"], capture_output=True)
-        return r.returncode == 0
+    return _port_in_use_socket(port)
 
-    ss = shutil.which("ss")
-    if ss:
-        r = subprocess.run(
-            [ss, "-tlnH", f"sport = :{port}"],
-            capture_output=True, text=True
+
+def ttyd_ready(name: str, port: int) -> bool:
+    """Readiness check for a session's ttyd, cheap path first.
+
+    Ports of ttyds we started (or adopted) live in _active_ports, so the
+    common case is a dict lookup instead of a connect() syscall. The probe
+    only runs for unknown sessions, and its positive result is adopted so
+    the next check is O(1) again. _revalidate_active_ports prunes dead
+    entries on its own 30s schedule.
+    """
+    _revalidate_active_ports()
+    if _active_ports.get(name) == port:
+        return True
+    if _port_in_use_socket(port):
+        _active_ports[name] = port
+        return True
+    return False
+
+
+# ─── tmux Control Mode ───────────────────────────────────────────────────────
+
+class _TmuxCommandError(Exception):
+    """tmux rejected a command sent over the control-mode connection."""
+
+
+class _TmuxControl:
+    """Persistent tmux control-mode client.
+
+    Every plain tmux invocation forks, execs a ~2MB binary and connects to
+    the server socket just to run one command. This client keeps a single
+    `tmux -C` process attached to a throwaway session and pipes commands over
+    stdin instead; replies are framed by %begin/%end/%error markers. Any
+    transport problem tears the client down and callers fall back to a
+    one-shot subprocess.
+    """
+
+    CTRL_SESSION = "_claude-hub-ctrl"
+
+    def __init__(self) -> None:
+        self._proc: Optional[subprocess.Popen] = None
+        self._buf = b""
+        self._lock = threading.Lock()
+
+    def _spawn(self) -> None:
+        self._proc = subprocess.Popen(
+            [TMUX_BIN, "-C", "new-session", "-A", "-s", self.CTRL_SESSION],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
         )
-        return bool(r.stdout.strip())
+        self._buf = b""
+        # Control mode acknowledges the implicit attach with one
+        # %begin/%end block; consume it so replies line up with commands.
+        self._read_block()
+
+    def _readline(self, deadline: float) -> bytes:
+        fd = self._proc.stdout.fileno()
+        while b"\n" not in self._buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("tmux control-mode read timed out")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                raise TimeoutError("tmux control-mode read timed out")
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise EOFError("tmux control-mode connection closed")
+            self._buf += chunk
+        line, self._buf = self._buf.split(b"\n", 1)
+        return line
+
+    def _read_block(self, timeout: float = 3.0) -> bytes:
+        deadline = time.monotonic() + timeout
+        lines: list[bytes] = []
+        in_block = False
+        while True:
+            line = self._readline(deadline)
+            if line.startswith(b"%begin"):
+                in_block = True
+                lines = []
+            elif in_block and line.startswith(b"%end"):
+                return b"\n".join(lines)
+            elif in_block and line.startswith(b"%error"):
+                raise _TmuxCommandError(b"\n".join(lines).decode("utf-8", "replace"))
+            elif in_block and not line.startswith(b"%"):
+                lines.append(line)
+            # async %notifications outside a block are dropped
+
+    def run(self, command: str) -> bytes:
+        """Run one tmux command, returning its output as bytes.
+
+        Raises _TmuxCommandError when tmux rejects the command and
+        OSError/EOFError when the transport itself is broken.
+        """
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._spawn()
+            try:
+                self._proc.stdin.write(command.encode() + b"\n")
+                self._proc.stdin.flush()
+                return self._read_block()
+            except (OSError, EOFError):
+                self.close(locked=True)
+                raise
+
+    def close(self, locked: bool = False) -> None:
+        """Kill the control-mode client process (the tmux server stays up)."""
+        if not locked:
+            with self._lock:
+                self.close(locked=True)
+            return
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            try:
+                proc.kill()
+            except OSError:
+                pass
 
-    return _port_in_use_socket(port)
 
+_tmux_ctrl = _TmuxControl()
+atexit.register(_tmux_ctrl.close)
 
-def get_sessions() -> list[dict]:
-    """List active Claude tmux sessions with their status."""
+
+def _tmux(*args: str) -> Optional[bytes]:
+    """Run a tmux command, preferring the control-mode connection.
+
+    Returns the command's stdout, or None if tmux reported an error
+    (e.g. has-session on a missing session). Transport failures fall back
+    to a one-shot subprocess invocation.
+    """
+    # Control mode is line-framed: a newline inside an argument would
+    # split the command in two and desync reply framing, with the tail
+    # parsed as a second tmux command. shlex.quote cannot protect against
+    # that, so such arguments take the argv-safe one-shot path.
+    if any("\n" in a or "\r" in a for a in args):
+        return _tmux_oneshot(*args)
     try:
-        from concurrent.futures import ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=2) as ex:
-            tmux_future = ex.submit(
-                subprocess.check_output,
-                [TMUX_BIN, "list-sessions", "-F",
-                 "#{session_name}|#{session_activity}|#{session_windows}|#{session_attached}"],
-                text=True, stderr=subprocess.DEVNULL
-            )
-            ports_future = ex.submit(get_ttyd_ports)
-            out = tmux_future.result(timeout=3)
-            ttyd_ports = ports_future.result(timeout=3)
-        sessions: list[dict] = []
-        for line in out.strip().split("\n"):
-            if not line.startswith("claude-"):
-                continue
-            parts = line.split("|")
-            name = parts[0].removeprefix("claude-")
-            try:
-                last_activity = datetime.fromtimestamp(int(parts[1]))
-                time_str = last_activity.strftime("%H:%M")
-            except (ValueError, IndexError):
-                time_str = "?"
-            attached = parts[3] if len(parts) > 3 else "0"
-            port = port_for_name(name)
-            sessions.append({
-                "name": name,
-                "port": port,
-                "time": time_str,
-                "attached": attached != "0",
-                "has_ttyd": port in ttyd_ports,
-            })
+        return _tmux_ctrl.run(" ".join(shlex.quote(a) for a in args))
+    except _TmuxCommandError:
+        return None
+    except (OSError, EOFError):
+        return _tmux_oneshot(*args)
+
+
+def _tmux_oneshot(*args: str) -> Optional[bytes]:
+    """Run a tmux command as a one-shot subprocess (argv, no quoting)."""
+    try:
+        return subprocess.check_output([TMUX_BIN, *args],
+                                       stderr=subprocess.DEVNULL,
+                                       close_fds=False)
+    except (subprocess.CalledProcessError, FileNotFoundError, OSError):
+        return None
+
+
+# ttyd processes spawned by this hub, keyed by port. Owning the Popen lets
+# stop_session() send SIGTERM directly instead of pattern-matching with pkill.
+_ttyd_procs: dict[int, subprocess.Popen] = {}
+
+# Ports of ttyd processes started by this hub, keyed by session name.
+# Persisted to a small state file so a hub restart re-adopts running ttyds
+# without having to scan ports. Revalidated lazily against the socket probe.
+_active_ports: dict[str, int] = {}
+_active_ports_checked = 0.0
+_REVALIDATE_INTERVAL = 30.0
+_STATE_FILE = os.path.join(INSTALL_DIR, "state.json")
+
+
+def _load_state() -> None:
+    """Restore the name->port map written by a previous hub process."""
+    try:
+        with open(_STATE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for name, port in data.get("active_ports", {}).items():
+            if isinstance(port, int) and BASE_PORT <= port <= MAX_PORT:
+                _active_ports[name] = port
+    except (FileNotFoundError, ValueError, OSError):
+        pass
+
+
+def _save_state() -> None:
+    """Persist the name->port map; best-effort."""
+    try:
+        os.makedirs(INSTALL_DIR, exist_ok=True)
+        with open(_STATE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"active_ports": _active_ports}, f)
+    except OSError:
+        pass
+
+
+def _revalidate_active_ports() -> None:
+    """Drop tracked ports whose ttyd has gone away. Runs at most every 30s.
+
+    One get_ttyd_ports() snapshot replaces a connect() probe per tracked
+    entry: on Linux that is a single /proc/net/tcp read however many
+    sessions are live.
+    """
+    global _active_ports_checked
+    now = time.monotonic()
+    if now - _active_ports_checked < _REVALIDATE_INTERVAL:
+        return
+    _active_ports_checked = now
+    if not _active_ports:
+        return
+    live = get_ttyd_ports()
+    dead = [n for n, p in _active_ports.items() if p not in live]
+    if dead:
+        for n in dead:
+            _active_ports.pop(n, None)
+        _save_state()
+
+
+_load_state()
+
+
+# Short TTL cache for get_sessions(): the dashboard and /api/sessions poll
+# frequently, and each refresh forks tmux + lsof. Serving cached results for
+# a moment collapses a refresh storm into one subprocess round per TTL window.
+# Stale-while-revalidate: within the soft TTL requests hit the cache; past
+# it they still get the stale list instantly while one daemon thread
+# refreshes behind the scenes. Only a cache older than the hard TTL (or an
+# explicit invalidation) makes a request wait on tmux.
+_SESSIONS_SOFT_TTL = 1.5
+_SESSIONS_HARD_TTL = 10.0
+_sessions_cache: dict = {"at": 0.0, "val": []}
+_sessions_lock = threading.Lock()
+_sessions_refreshing = False
+
+
+def _invalidate_sessions_cache() -> None:
+    """Force the next get_sessions() call to refresh."""
+    _sessions_cache["at"] = 0.0
+    _render_hub_cached.cache_clear()
+
+
+def _refresh_sessions() -> list[dict]:
+    """Fetch and store the session list; serializes concurrent refreshers."""
+    global _sessions_refreshing
+    with _sessions_lock:
+        # Another thread may have refreshed while we waited for the lock
+        if time.monotonic() - _sessions_cache["at"] < _SESSIONS_SOFT_TTL:
+            return _sessions_cache["val"]
+        try:
+            sessions = _fetch_sessions()
+        finally:
+            _sessions_refreshing = False
+        _sessions_cache["val"] = sessions
+        _sessions_cache["at"] = time.monotonic()
         return sessions
-    except (subprocess.CalledProcessError, FileNotFoundError):
+
+
+def get_sessions() -> list[dict]:
+    """List active Claude tmux sessions with their status (cached briefly)."""
+    global _sessions_refreshing
+    age = time.monotonic() - _sessions_cache["at"]
+    if age < _SESSIONS_SOFT_TTL:
+        return _sessions_cache["val"]
+    if age < _SESSIONS_HARD_TTL:
+        if not _sessions_refreshing:
+            _sessions_refreshing = True
+            threading.Thread(target=_refresh_sessions, daemon=True).start()
+        return _sessions_cache["val"]
+    return _refresh_sessions()
+
+
+def _fetch_sessions() -> list[dict]:
+    """Query tmux for the live session list (uncached)."""
+    out = _tmux(
+        "list-sessions", "-F",
+        "#{session_name}|#{session_activity}|#{session_windows}|#{session_attached}")
+    # None (no tmux server) and empty output short-circuit before any
+    # per-line work or port revalidation
+    if not out or not out.strip():
         return []
+    _revalidate_active_ports()
+    sessions: list[dict] = []
+    # Listening-port snapshot for adopting ttyds the state file missed,
+    # taken at most once per fetch and only when an unknown name shows up
+    live_ports: Optional[set[int]] = None
+    # Work on bytes; only session names get decoded for JSON/HTML
+    for line in out.strip().split(b"\n"):
+        if not line.startswith(b"claude-"):
+            continue
+        # partition instead of split: no intermediate list per session
+        name_b, _, rest = line.partition(b"|")
+        name = name_b.removeprefix(b"claude-").decode("utf-8", "replace")
+        activity, _, rest = rest.partition(b"|")
+        _windows, _, attached = rest.partition(b"|")
+        try:
+            lt = time.localtime(int(activity))
+            time_str = f"{lt.tm_hour:02d}:{lt.tm_min:02d}"
+        except ValueError:
+            time_str = "?"
+        port = port_for_name(name)
+        has_ttyd = name in _active_ports
+        if not has_ttyd:
+            if live_ports is None:
+                live_ports = get_ttyd_ports()
+            if port in live_ports:
+                # ttyd from before a hub restart that the state file missed
+                _active_ports[name] = port
+                has_ttyd = True
+        sessions.append({
+            "name": name,
+            "port": port,
+            "time": time_str,
+            "attached": attached not in (b"", b"0"),
+            "has_ttyd": has_ttyd,
+        })
+    return sessions
 
 
 def discover_capturable_sessions() -> list:
@@ -301,7 +724,7 @@ def discover_capturable_sessions() -> list:
     try:
         out = subprocess.check_output(
             [TMUX_BIN, "list-panes", "-a", "-F", "#{pane_pid}"],
-            text=True, stderr=subprocess.DEVNULL
+            text=True, stderr=subprocess.DEVNULL, close_fds=False
         )
         for line in out.strip().split("\n"):
             if line.strip().isdigit():
@@ -314,7 +737,8 @@ def discover_capturable_sessions() -> list:
     if tmux_pids:
         try:
             ps_out = subprocess.check_output(
-                ["ps", "-eo", "pid,ppid"], text=True, stderr=subprocess.DEVNULL
+                ["ps", "-eo", "pid,ppid"], text=True,
+                stderr=subprocess.DEVNULL, close_fds=False
             )
             # Build parent->children map
             children_map: dict = {}
@@ -339,7 +763,7 @@ def discover_capturable_sessions() -> list:
     try:
         ps_out = subprocess.check_output(
             ["ps", "-eo", "pid,ppid,tty,command"],
-            text=True, stderr=subprocess.DEVNULL
+            text=True, stderr=subprocess.DEVNULL, close_fds=False
         )
     except (subprocess.CalledProcessError, FileNotFoundError):
         return []
@@ -384,33 +808,66 @@ def discover_capturable_sessions() -> list:
     return capturable
 
 
+# Folder listings cached briefly per directory: tapping through the picker
+# and back re-requests the same paths within a second or two.
+# Keyed by resolved path; entries carry the directory's mtime so a single
+# stat both validates and invalidates — edits show up immediately, and an
+# untouched tree is served from cache indefinitely
+_folders_cache: dict[str, tuple[Optional[int], dict]] = {}
+_FOLDERS_CACHE_MAX = 128
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_rel_path(rel_path: str) -> str:
+    """Resolve a picker path under DEV_ROOT, collapsing escapes to the root.
+
+    realpath walks every component, so an intermediate symlink pointing
+    outside DEV_ROOT cannot smuggle its subtree past a pure-string check;
+    the cache keeps the readlink walk off the per-request path.
+    """
+    base = _DEV_ROOT_REAL
+    target = os.path.realpath(os.path.join(base, rel_path))
+    if target != base and not target.startswith(base + os.sep):
+        return base
+    return target
+
+
 def get_folders(rel_path: str = "") -> dict:
     """List subdirectories under DEV_ROOT for the folder picker."""
-    base = os.path.realpath(DEV_ROOT)
-    if not os.path.isdir(base):
-        base = os.path.expanduser("~")
-
-    target = os.path.realpath(os.path.join(base, rel_path)) if rel_path else base
+    base = _DEV_ROOT_REAL
 
-    if not target.startswith(base):
-        target = base
+    target = _resolve_rel_path(rel_path) if rel_path else base
     if not os.path.isdir(target):
         target = base
 
+    try:
+        dir_mtime = os.stat(target).st_mtime_ns
+    except OSError:
+        dir_mtime = None
+
+    cached = _folders_cache.get(target)
+    if cached is not None and dir_mtime is not None and cached[0] == dir_mtime:
+        return cached[1]
+
     folders: list[str] = []
 
     try:
-        for entry in sorted(os.scandir(target), key=lambda e: e.name.lower()):
-            if entry.is_dir() and not entry.name.startswith(".") and entry.name not in IGNORED_DIRS:
-                folders.append(entry.name)
+        with os.scandir(target) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith(".") or name in IGNORED_DIRS:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    folders.append(name)
     except (PermissionError, FileNotFoundError, OSError):
         pass
+    folders.sort(key=str.lower)
 
     display_path = os.path.relpath(target, base)
     if display_path == ".":
         display_path = ""
 
-    return {
+    result = {
         "folders": folders,
         "current": display_path,
         "absolute": target,
@@ -418,35 +875,65 @@ def get_folders(rel_path: str = "") -> dict:
         "root_name": os.path.basename(base),
     }
 
+    if len(_folders_cache) >= _FOLDERS_CACHE_MAX:
+        _folders_cache.pop(next(iter(_folders_cache)))
+    _folders_cache[target] = (dir_mtime, result)
+    return result
+
+
+def _wait_for_tmux_session(session: str, timeout: float = 0.5) -> None:
+    """Poll until a tmux session exists, instead of a fixed sleep."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if _tmux("has-session", "-t", session) is not None:
+            return
+        time.sleep(0.01)
+
+
+def _wait_for_port(port: int, timeout: float = 0.3) -> bool:
+    """Poll until something is listening on the port, instead of a fixed sleep."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if _port_in_use_socket(port):
+            return True
+        time.sleep(0.01)
+    return False
+
 
-def _start_ttyd(session: str, port: int) -> None:
-    """Start a ttyd process attached to a tmux session if not already running."""
+# Immutable ttyd flags, assembled once; _start_ttyd appends only the
+# per-session port, index/cert args and attach command
+_TTYD_BASE_ARGS = [
+    TTYD_BIN, "-W",
+    "--ping-interval", "5",
+    "-t", f"fontSize={FONT_SIZE}",
+    "-t", 'theme={"background":"#0f0f1a","foreground":"#e8e8f0","cursor":"#7c83ff"}',
+    "-t", "titleFixed=Claude Remote Hub",
+]
+
+
+def _start_ttyd(session: str, port: int) -> bool:
+    """Start a ttyd attached to a tmux session if not already running.
+
+    Returns True only once something is actually listening on the port,
+    so callers never record a ttyd that failed to launch or bind.
+    """
     if port_in_use(port):
-        return
-    ttyd_cmd = [
-        TTYD_BIN, "-W", "-p", str(port),
-        "--ping-interval", "5",
-        "-t", f"fontSize={FONT_SIZE}",
-        "-t", 'theme={"background":"#0f0f1a","foreground":"#e8e8f0","cursor":"#7c83ff"}',
-        "-t", "titleFixed=Claude Remote Hub",
-    ]
+        return True
+    ttyd_cmd = _TTYD_BASE_ARGS + ["-p", str(port)]
     # Custom index file for virtual keyboard overlay
-    custom_index = os.path.join(INSTALL_DIR, "ttyd-index.html")
-    if os.path.exists(custom_index):
-        ttyd_cmd += ["-I", custom_index]
+    if os.path.exists(TTYD_INDEX_FILE):
+        ttyd_cmd += ["-I", TTYD_INDEX_FILE]
 
     # HTTPS: use certs if available
-    cert_file = os.path.join(INSTALL_DIR, "hub.crt")
-    key_file = os.path.join(INSTALL_DIR, "hub.key")
-    if os.path.exists(cert_file) and os.path.exists(key_file):
-        ttyd_cmd += ["-S", "-C", cert_file, "-K", key_file]
+    if os.path.exists(CERT_FILE) and os.path.exists(KEY_FILE):
+        ttyd_cmd += ["-S", "-C", CERT_FILE, "-K", KEY_FILE]
 
     ttyd_cmd += ["tmux", "attach-session", "-t", session]
-    subprocess.Popen(
+    _ttyd_procs[port] = subprocess.Popen(
         ttyd_cmd,
         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
     )
-    time.sleep(0.3)
+    return _wait_for_port(port)
 
 
 def start_session(name: str, directory: Optional[str] = None, skip_permissions: bool = False) -> int:
@@ -454,24 +941,28 @@ def start_session(name: str, directory: Optional[str] = None, skip_permissions:
     port = port_for_name(name)
     session = f"claude-{name}"
 
-    r = subprocess.run([TMUX_BIN, "has-session", "-t", session],
-                       capture_output=True)
-    if r.returncode != 0:
+    if _tmux("has-session", "-t", session) is None:
         cmd = [TMUX_BIN, "new-session", "-d", "-s", session]
         if directory and os.path.isdir(directory):
             cmd += ["-c", directory]
         cmd.append(CLAUDE_BIN)
         if skip_permissions:
             cmd.append("--dangerously-skip-permissions")
+        # ';' chains a second tmux command into the same invocation, so
+        # mouse mode is set atomically with session creation
+        cmd += [";", "set-option", "-t", session, "mouse", "on"]
         subprocess.Popen(
             cmd,
             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
         )
-        time.sleep(0.5)
-        subprocess.run([TMUX_BIN, "set-option", "-t", session, "mouse", "on"],
-                       capture_output=True)
-
-    _start_ttyd(session, port)
+        _wait_for_tmux_session(session)
+
+    if _start_ttyd(session, port):
+        # Only record a ttyd we saw listening; a bad entry would make
+        # ttyd_ready answer True for a dead port until the next revalidation
+        _active_ports[name] = port
+        _save_state()
+    _invalidate_sessions_cache()
     return port
 
 
@@ -487,9 +978,7 @@ def capture_session(pid: int, session_id: Optional[str], cwd: str,
     suffix = 1
     while True:
         session = f"claude-{name}"
-        r = subprocess.run([TMUX_BIN, "has-session", "-t", session],
-                           capture_output=True)
-        if r.returncode != 0:
+        if _tmux("has-session", "-t", session) is None:
             break
         suffix += 1
         name = f"{base_name}-{suffix}"
@@ -509,14 +998,15 @@ def capture_session(pid: int, session_id: Optional[str], cwd: str,
         cmd.append("--continue")
     if skip_permissions:
         cmd.append("--dangerously-skip-permissions")
+    cmd += [";", "set-option", "-t", session, "mouse", "on"]
 
     subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    time.sleep(0.5)
-
-    subprocess.run([TMUX_BIN, "set-option", "-t", session, "mouse", "on"],
-                   capture_output=True)
+    _wait_for_tmux_session(session)
 
-    _start_ttyd(session, port)
+    if _start_ttyd(session, port):
+        _active_ports[name] = port
+        _save_state()
+    _invalidate_sessions_cache()
     return port, name
 
 
@@ -525,46 +1015,66 @@ def stop_session(name: str) -> None:
     port = port_for_name(name)
     session = f"claude-{name}"
 
-    pkill = shutil.which("pkill")
-    if pkill:
-        subprocess.run([pkill, "-f", f"ttyd.*-p {port}"],
-                       capture_output=True)
-    else:
-        # Fallback: find and kill ttyd process via port
-        try:
-            lsof = shutil.which("lsof")
-            if lsof:
-                out = subprocess.check_output(
-                    [lsof, "-ti", f":{port}"], text=True, stderr=subprocess.DEVNULL
-                ).strip()
-                for pid_str in out.split("\n"):
-                    if pid_str.isdigit():
-                        os.kill(int(pid_str), signal.SIGTERM)
-        except (subprocess.CalledProcessError, ValueError):
-            pass
-
-    subprocess.run([TMUX_BIN, "kill-session", "-t", session],
-                   capture_output=True)
+    proc = _ttyd_procs.pop(port, None)
+    if proc is not None and proc.poll() is None:
+        proc.terminate()
+    elif proc is None:
+        # ttyd from before a hub restart: fall back to pattern matching
+        pkill = shutil.which("pkill")
+        if pkill:
+            subprocess.run([pkill, "-f", f"ttyd.*-p {port}"],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           close_fds=False)
+        else:
+            try:
+                lsof = shutil.which("lsof")
+                if lsof:
+                    out = subprocess.check_output(
+                        [lsof, "-ti", f":{port}"], text=True,
+                        stderr=subprocess.DEVNULL, close_fds=False
+                    ).strip()
+                    for pid_str in out.split("\n"):
+                        if pid_str.isdigit():
+                            os.kill(int(pid_str), signal.SIGTERM)
+            except (subprocess.CalledProcessError, ValueError):
+                pass
+
+    _tmux("kill-session", "-t", session)
+    if _active_ports.pop(name, None) is not None:
+        _save_state()
+    _invalidate_sessions_cache()
 
 
 # ─── HTML Rendering ─────────────────────────────────────────────────────────
 
-def render_hub(host: str) -> str:
-    """Render the dashboard with active sessions."""
-    sessions = get_sessions()
+# hub.html split once around its dynamic placeholders so each render only
+# stitches the session cards and counter into pre-built static segments.
+_hub_segments: Optional[tuple[str, str, str]] = None
 
-    session_cards = ""
-    for s in sessions:
-        status_class = "active" if s["has_ttyd"] else "idle"
-        attached_badge = '<span class="badge active">connected</span>' if s["attached"] else ""
-        session_cards += f"""
+
+def _hub_template_segments() -> tuple[str, str, str]:
+    """Return hub.html split at {{COUNT_TEXT}} and {{SESSION_CARDS}}."""
+    global _hub_segments
+    if _hub_segments is None:
+        html = _load_template("hub.html").replace("{{VERSION}}", VERSION)
+        head, _, rest = html.partition("{{COUNT_TEXT}}")
+        mid, _, tail = rest.partition("{{SESSION_CARDS}}")
+        _hub_segments = (head, mid, tail)
+    return _hub_segments
+
+
+# Static card scaffolding, defined once; only the per-session fields are
+# interpolated at render time
+_ATTACHED_BADGE = '<span class="badge active">connected</span>'
+
+_CARD_TPL = """
         <div class="card">
-          <a href="/start/{s['name']}" class="card-link">
+          <a href="/start/{name}" class="card-link">
             <div class="card-left">
               <span class="status-dot {status_class}"></span>
               <div>
-                <div class="card-name">{s['name']}</div>
-                <div class="card-meta">port {s['port']} &middot; {s['time']}</div>
+                <div class="card-name">{name}</div>
+                <div class="card-meta">port {port} &middot; {time_str}</div>
               </div>
             </div>
             <div class="card-right">
@@ -572,13 +1082,12 @@ def render_hub(host: str) -> str:
               <span class="arrow">&rsaquo;</span>
             </div>
           </a>
-          <button class="stop-btn" onclick="event.preventDefault();if(confirm('Stop session {s['name']}?'))location='/stop/{s['name']}'">
+          <button class="stop-btn" onclick="event.preventDefault();if(confirm('Stop session {name}?'))location='/stop/{name}'">
             <svg width="14" height="14" viewBox="0 0 14 14" fill="none"><path d="M1 1l12 12M13 1L1 13" stroke="currentColor" stroke-width="1.5" stroke-linecap="round"/></svg>
           </button>
         </div>"""
 
-    if not sessions:
-        session_cards = """
+_EMPTY_STATE_HTML = """
         <div class="empty">
           <svg class="empty-icon" width="48" height="48" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="1.5" stroke-linecap="round" stroke-linejoin="round">
             <polyline points="4 17 10 11 4 5"></polyline><line x1="12" y1="19" x2="20" y2="19"></line>
@@ -587,26 +1096,153 @@ def render_hub(host: str) -> str:
           <p class="empty-sub">Create one below to get started</p>
         </div>"""
 
-    count = len(sessions)
+
+def render_hub(host: str) -> bytes:
+    """Render the dashboard with active sessions."""
+    sessions = get_sessions()
+    key = tuple((s["name"], s["port"], s["time"], s["attached"], s["has_ttyd"])
+                for s in sessions)
+    return _render_hub_cached(key)
+
+
+@functools.lru_cache(maxsize=16)
+def _render_hub_cached(sessions_key: tuple) -> bytes:
+    """Build the dashboard HTML for a given session-state fingerprint.
+
+    The page is a pure function of the session state, so identical polls
+    within the cache window reuse the previously encoded bytes.
+    """
+    cards: list[str] = []
+    for name, port, time_str, attached, has_ttyd in sessions_key:
+        cards.append(_CARD_TPL.format(
+            name=name,
+            port=port,
+            time_str=time_str,
+            status_class="active" if has_ttyd else "idle",
+            attached_badge=_ATTACHED_BADGE if attached else "",
+        ))
+
+    if not sessions_key:
+        cards.append(_EMPTY_STATE_HTML)
+
+    count = len(sessions_key)
     count_text = f"{count} active session" if count == 1 else f"{count} active sessions"
 
-    html = _load_template("hub.html")
-    return (html
-            .replace("{{COUNT_TEXT}}", count_text)
-            .replace("{{SESSION_CARDS}}", session_cards)
-            .replace("{{VERSION}}", VERSION))
+    head, mid, tail = _hub_template_segments()
+    return "".join((head, count_text, mid, "".join(cards), tail)).encode()
+
+
+# terminal.html compiled once into a string.Template: substitute() does a
+# single C-level scan instead of chained .replace passes over the whole page.
+_terminal_tpl: Optional[string.Template] = None
+
 
+def _terminal_template() -> string.Template:
+    global _terminal_tpl
+    if _terminal_tpl is None:
+        html = _load_template("terminal.html").replace("$", "$$")
+        html = (html
+                .replace("{{SESSION_NAME}}", "${SESSION_NAME}")
+                .replace("{{TERMINAL_URL}}", "${TERMINAL_URL}"))
+        _terminal_tpl = string.Template(html)
+    return _terminal_tpl
 
-def render_terminal(name: str, port: int, host: str) -> str:
-    """Render the terminal wrapper page."""
+
+@functools.lru_cache(maxsize=64)
+def render_terminal(name: str, port: int, host: str) -> bytes:
+    """Render the terminal wrapper page (memoized as encoded bytes).
+
+    The page is deterministic per (name, port, host), and iOS reloads it on
+    every visibilitychange, so repeats skip the substitution and encode.
+    """
     terminal_url = f"https://{host}:{port}"
-    html = _load_template("terminal.html")
-    return html.replace("{{SESSION_NAME}}", name).replace("{{TERMINAL_URL}}", terminal_url)
+    html = _terminal_template().substitute(SESSION_NAME=name, TERMINAL_URL=terminal_url)
+    return html.encode()
+
+
+# Rendered pages are already memoized as bytes; cache their gzipped form
+# too so compression runs once per distinct payload, not per request.
+# Tiny JSON bodies are not worth the gzip header overhead.
+_GZIP_MIN_SIZE = 512
+
+
+@functools.lru_cache(maxsize=32)
+def _gzip_cached(body: bytes) -> bytes:
+    """Compressed copy of a rendered response, keyed by content."""
+    return gzip.compress(body, 6)
+
+
+# Static assets (icon, cert) read once and kept in memory
+_static_cache: dict[str, bytes] = {}
+
+
+def _static_bytes(path: str) -> Optional[bytes]:
+    """Return a small static file's contents, reading it at most once."""
+    data = _static_cache.get(path)
+    if data is None:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        _static_cache[path] = data
+    return data
+
+
+@functools.lru_cache(maxsize=8)
+def _static_etag(data: bytes) -> str:
+    """Strong ETag for an in-memory static asset; hashed once per asset."""
+    return '"' + hashlib.blake2b(data, digest_size=8).hexdigest() + '"'
+
+
+# tmux key names the VK bar may send; rebuilt as a set literal per request
+# before, now a shared constant
+_ALLOWED_KEYS = frozenset({
+    "Escape", "Tab", "BTab", "Enter", "Space",
+    "Up", "Down", "Left", "Right",
+    "C-c", "C-v", "C-z", "C-d", "C-l", "C-a", "C-e",
+    "C-r", "C-w", "C-u", "C-k", "C-b", "C-f", "C-n", "C-p",
+})
 
 
 # ─── HTTP Handler ────────────────────────────────────────────────────────────
 
 class HubHandler(BaseHTTPRequestHandler):
+    # Keep-alive: VK-bar bursts and page-load fetches reuse one TCP/TLS
+    # connection instead of paying a handshake per request. Every response
+    # with a body MUST carry Content-Length or the connection would hang.
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections block a pool worker in rfile.readline();
+    # the socket timeout makes BaseHTTPRequestHandler close them so a few
+    # silent clients cannot starve the pool
+    timeout = 30
+
+    def _maybe_gzip(self, body: bytes) -> tuple[bytes, Optional[str]]:
+        """Compress a response body when the client accepts gzip."""
+        if (len(body) >= _GZIP_MIN_SIZE
+                and "gzip" in self.headers.get("Accept-Encoding", "")):
+            return _gzip_cached(body), "gzip"
+        return body, None
+
+    def _send_with_etag(self, body: bytes, content_type: str):
+        """Send a response with a strong ETag, short-circuiting to 304 on match."""
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body, encoding = self._maybe_gzip(body)
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def _cors_headers(self):
         origin = self.headers.get("Origin", "")
         if origin:
@@ -614,281 +1250,434 @@ class HubHandler(BaseHTTPRequestHandler):
             self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
             self.send_header("Access-Control-Allow-Headers", "Content-Type")
 
+    def do_HEAD(self):
+        # Lightweight probe used by the terminal page before deciding
+        # whether a backgrounded iframe needs a full reconnect
+        path = unquote(urlparse(self.path).path)
+        if path.startswith("/api/ttyd-ready/"):
+            name = path.split("/api/ttyd-ready/")[1].strip("/")
+            ready = ttyd_ready(name, port_for_name(name))
+            self.send_response(200 if ready else 503)
+            self.send_header("Cache-Control", "no-cache, no-store")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
     def do_OPTIONS(self):
         self.send_response(204)
         self._cors_headers()
         self.end_headers()
 
+    def _redirect(self, location: str):
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
     def do_GET(self):
         parsed = urlparse(self.path)
         path = unquote(parsed.path)
         qs = parse_qs(parsed.query)
 
-        # Start session
-        if path.startswith("/start/"):
-            name = path.split("/start/")[1].strip("/")
-            if not name:
-                self.send_response(302)
-                self.send_header("Location", "/")
-                self.end_headers()
-                return
-            directory = qs.get("dir", [None])[0]
-            skip_permissions = qs.get("skip_permissions", ["0"])[0] == "1"
-            start_session(name, directory, skip_permissions)
-            self.send_response(302)
-            self.send_header("Location", f"/terminal/{name}")
-            self.end_headers()
+        handler = _GET_EXACT.get(path)
+        if handler is not None:
+            handler(self, qs)
             return
-
-        # Terminal wrapper
-        if path.startswith("/terminal/"):
-            name = path.split("/terminal/")[1].strip("/")
-            if not name:
-                self.send_response(302)
-                self.send_header("Location", "/")
-                self.end_headers()
+        for pattern, fn in _GET_ROUTES:
+            m = pattern.match(path)
+            if m:
+                fn(self, m.group("name").strip("/"), qs)
                 return
-            port = port_for_name(name)
-            host = self.headers.get("Host", "localhost").split(":")[0]
-            html = render_terminal(name, port, host)
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.send_header("Cache-Control", "no-cache")
-            self.end_headers()
-            self.wfile.write(html.encode())
-            return
 
-        # Stop session
-        if path.startswith("/stop/"):
-            name = path.split("/stop/")[1].strip("/")
-            stop_session(name)
-            self.send_response(302)
-            self.send_header("Location", "/")
-            self.end_headers()
-            return
+        # Hub dashboard (default for "/" and anything unrouted)
+        host = self.headers.get("Host", f"localhost:{HUB_PORT}")
+        self._send_with_etag(render_hub(host), "text/html; charset=utf-8")
 
-        # API: list sessions (JSON)
-        if path == "/api/sessions":
-            sessions = get_sessions()
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps(sessions).encode())
-            return
+    # ── GET handlers ──
 
-        # API: check if ttyd is ready
-        if path.startswith("/api/ttyd-ready/"):
-            name = path.split("/api/ttyd-ready/")[1].strip("/")
-            port = port_for_name(name)
-            ready = port_in_use(port)
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.send_header("Cache-Control", "no-cache, no-store")
-            self.end_headers()
-            self.wfile.write(json.dumps({"ready": ready, "port": port}).encode())
+    def _get_start(self, name, qs):
+        """Start session."""
+        if not name:
+            self._redirect("/")
             return
-
-        # API: list capturable sessions (JSON)
-        if path == "/api/capturable":
-            sessions = discover_capturable_sessions()
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.send_header("Cache-Control", "no-cache, no-store")
-            self.end_headers()
-            self.wfile.write(json.dumps(sessions).encode())
+        directory = qs.get("dir", [None])[0]
+        skip_permissions = qs.get("skip_permissions", ["0"])[0] == "1"
+        start_session(name, directory, skip_permissions)
+        self._redirect(f"/terminal/{name}")
+
+    def _get_terminal(self, name, qs):
+        """Terminal wrapper page."""
+        if not name:
+            self._redirect("/")
             return
+        port = port_for_name(name)
+        host = self.headers.get("Host", "localhost").split(":")[0]
+        body, encoding = self._maybe_gzip(render_terminal(name, port, host))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
-        # Capture a running Claude CLI session
-        if path == "/capture":
-            try:
-                pid = int(qs.get("pid", [0])[0])
-            except (ValueError, IndexError):
-                pid = 0
-            cwd = qs.get("cwd", [""])[0]
-            session_id = qs.get("session_id", [None])[0]
-            name = qs.get("name", [""])[0]
-            skip_permissions = qs.get("skip_permissions", ["0"])[0] == "1"
-
-            if not pid or not name:
-                self.send_response(302)
-                self.send_header("Location", "/")
-                self.end_headers()
-                return
+    def _get_stop(self, name, qs):
+        """Stop session."""
+        stop_session(name)
+        self._redirect("/")
 
-            # Verify the process still exists
-            try:
-                os.kill(pid, 0)
-            except (ProcessLookupError, PermissionError):
-                self.send_response(302)
-                self.send_header("Location", "/?error=process_gone")
-                self.end_headers()
-                return
+    def _get_api_sessions(self, qs):
+        """API: list sessions (JSON)."""
+        body = _json_dumps(get_sessions())
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
-            port, final_name = capture_session(pid, session_id, cwd, name, skip_permissions)
-            self.send_response(302)
-            self.send_header("Location", f"/terminal/{final_name}")
-            self.end_headers()
+    def _get_ttyd_ready(self, name, qs):
+        """API: check if ttyd is ready."""
+        port = port_for_name(name)
+        ready = ttyd_ready(name, port)
+        body = _json_dumps({"ready": ready, "port": port})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Cache-Control", "no-cache, no-store")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _get_ttyd_wait(self, name, qs):
+        """API: long-poll until ttyd is ready — one request instead of a
+        client-side polling loop."""
+        port = port_for_name(name)
+        deadline = time.monotonic() + 25
+        ready = ttyd_ready(name, port)
+        while not ready and time.monotonic() < deadline:
+            time.sleep(0.05)
+            ready = ttyd_ready(name, port)
+        body = _json_dumps({"ready": ready, "port": port})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Cache-Control", "no-cache, no-store")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _get_api_events(self, qs):
+        """API: server-sent events stream of session-state changes.
+
+        Pushes the session list once on connect and again only when its
+        fingerprint changes, with comment keepalives in between — a client
+        holding this stream never needs to poll /api/sessions. The stream
+        has no Content-Length, so the connection is closed when it ends;
+        the 5-minute cap makes clients reconnect instead of pinning one of
+        the pool's worker threads forever.
+        """
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache, no-store")
+        self.end_headers()
+        last_key = None
+        last_write = 0.0
+        deadline = time.monotonic() + 300
+        try:
+            while time.monotonic() < deadline:
+                sessions = get_sessions()
+                key = tuple(
+                    (s["name"], s["port"], s["time"], s["attached"], s["has_ttyd"])
+                    for s in sessions)
+                now = time.monotonic()
+                if key != last_key:
+                    self.wfile.write(b"data: " + _json_dumps(sessions) + b"\n\n")
+                    self.wfile.flush()
+                    last_key = key
+                    last_write = now
+                elif now - last_write >= 15:
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+                    last_write = now
+                time.sleep(1.0)
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+
+    def _get_api_capturable(self, qs):
+        """API: list capturable sessions (JSON)."""
+        body = _json_dumps(discover_capturable_sessions())
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Cache-Control", "no-cache, no-store")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _get_capture(self, qs):
+        """Capture a running Claude CLI session."""
+        try:
+            pid = int(qs.get("pid", [0])[0])
+        except (ValueError, IndexError):
+            pid = 0
+        cwd = qs.get("cwd", [""])[0]
+        session_id = qs.get("session_id", [None])[0]
+        name = qs.get("name", [""])[0]
+        skip_permissions = qs.get("skip_permissions", ["0"])[0] == "1"
+
+        if not pid or not name:
+            self._redirect("/")
             return
 
-        # Download SSL certificate
-        if path == "/cert":
-            cert_path = os.path.join(INSTALL_DIR, "hub.crt")
-            if os.path.exists(cert_path):
-                with open(cert_path, "rb") as f:
-                    cert_data = f.read()
-                self.send_response(200)
-                self.send_header("Content-Type", "application/x-x509-ca-cert")
-                self.send_header("Content-Disposition", "attachment; filename=claude-remote-hub.crt")
-                self.end_headers()
-                self.wfile.write(cert_data)
-            else:
-                self.send_response(404)
-                self.end_headers()
+        # Verify the process still exists
+        try:
+            os.kill(pid, 0)
+        except (ProcessLookupError, PermissionError):
+            self._redirect("/?error=process_gone")
             return
 
-        # API: list folders
-        if path == "/api/folders":
-            rel_path = qs.get("path", [""])[0]
-            data = get_folders(rel_path)
+        port, final_name = capture_session(pid, session_id, cwd, name, skip_permissions)
+        self._redirect(f"/terminal/{final_name}")
+
+    def _get_cert(self, qs):
+        """Download SSL certificate."""
+        cert_data = _static_bytes(CERT_FILE)
+        if cert_data is not None:
+            etag = _static_etag(cert_data)
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
             self.send_response(200)
-            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Type", "application/x-x509-ca-cert")
+            self.send_header("Content-Disposition", "attachment; filename=claude-remote-hub.crt")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(cert_data)))
+            self.end_headers()
+            self.wfile.write(cert_data)
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
             self.end_headers()
-            self.wfile.write(json.dumps(data).encode())
-            return
 
-        # Icon
-        if path == "/icon.png":
-            icon_path = os.path.join(INSTALL_DIR, "icon_chub.png")
-            if not os.path.exists(icon_path):
-                icon_path = os.path.join(SCRIPT_DIR, "icon_chub.png")
-            if os.path.exists(icon_path):
-                with open(icon_path, "rb") as f:
-                    icon_data = f.read()
-                self.send_response(200)
-                self.send_header("Content-Type", "image/png")
-                self.send_header("Cache-Control", "public, max-age=86400")
-                self.end_headers()
-                self.wfile.write(icon_data)
-            else:
-                self.send_response(404)
+    def _get_api_folders(self, qs):
+        """API: list folders."""
+        rel_path = qs.get("path", [""])[0]
+        data = get_folders(rel_path)
+        self._send_with_etag(_json_dumps(data), "application/json")
+
+    def _get_icon(self, qs):
+        """Icon."""
+        icon_data = _static_bytes(ICON_FILE)
+        if icon_data is None:
+            icon_data = _static_bytes(ICON_FALLBACK_FILE)
+        if icon_data is not None:
+            etag = _static_etag(icon_data)
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
                 self.end_headers()
-            return
-
-        # Hub dashboard
-        host = self.headers.get("Host", f"localhost:{HUB_PORT}")
-        html = render_hub(host)
-        self.send_response(200)
-        self.send_header("Content-Type", "text/html; charset=utf-8")
-        self.send_header("Cache-Control", "no-cache")
-        self.end_headers()
-        self.wfile.write(html.encode())
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Cache-Control", "public, max-age=86400")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(icon_data)))
+            self.end_headers()
+            self.wfile.write(icon_data)
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
 
     def _send_json(self, data: dict, status: int = 200):
+        body = _json_dumps(data)
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self._cors_headers()
+        self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(body)
+
+    # POST bodies are tiny JSON dicts; anything bigger is not ours
+    _MAX_POST_BODY = 16384
+
+    def _read_json_body(self) -> Optional[dict]:
+        """Read and parse a JSON request body, rejecting oversized payloads."""
+        length = int(self.headers.get("Content-Length", 0))
+        if length > self._MAX_POST_BODY:
+            # Body stays unread, so the keep-alive stream is out of sync
+            self.close_connection = True
+            self._send_json({"error": "body too large"}, 413)
+            return None
+        try:
+            return _json_loads(self.rfile.read(length))
+        except ValueError:
+            self._send_json({"error": "invalid json"}, 400)
+            return None
 
     def do_POST(self):
-        parsed = urlparse(self.path)
-        path = unquote(parsed.path)
-
-        # API: send special key via tmux
-        if path.startswith("/api/send-keys/"):
-            name = path.split("/api/send-keys/")[1].strip("/")
-            session = f"claude-{name}"
-            content_length = int(self.headers.get("Content-Length", 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body)
-            key = data.get("key", "")
-
-            allowed_keys = {
-                "Escape", "Tab", "BTab", "Enter", "Space",
-                "Up", "Down", "Left", "Right",
-                "C-c", "C-v", "C-z", "C-d", "C-l", "C-a", "C-e",
-                "C-r", "C-w", "C-u", "C-k", "C-b", "C-f", "C-n", "C-p",
-            }
-
-            if key not in allowed_keys:
-                self._send_json({"error": "key not allowed"}, 400)
+        path = unquote(urlparse(self.path).path)
+        for pattern, fn in _POST_ROUTES:
+            m = pattern.match(path)
+            if m:
+                fn(self, m.group("name").strip("/"))
                 return
+        # Request body is never read on this path; drop the connection so
+        # leftover bytes cannot be parsed as the next request
+        self.close_connection = True
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
 
-            subprocess.run(
-                [TMUX_BIN, "send-keys", "-t", session, key],
-                capture_output=True
-            )
-            self._send_json({"ok": True})
+    # ── POST handlers ──
+
+    def _post_send_keys(self, name):
+        """API: send special key via tmux."""
+        session = f"claude-{name}"
+        data = self._read_json_body()
+        if data is None:
             return
+        key = data.get("key", "")
 
-        # API: send text (paste) via tmux
-        if path.startswith("/api/send-text/"):
-            name = path.split("/api/send-text/")[1].strip("/")
-            session = f"claude-{name}"
-            content_length = int(self.headers.get("Content-Length", 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body)
-            text = data.get("text", "")
-
-            if not text or len(text) > 10000:
-                self._send_json({"error": "invalid text"}, 400)
-                return
+        if key not in _ALLOWED_KEYS:
+            self._send_json({"error": "key not allowed"}, 400)
+            return
 
-            proc = subprocess.run(
-                [TMUX_BIN, "load-buffer", "-"],
-                input=text, capture_output=True, text=True
-            )
-            if proc.returncode == 0:
-                subprocess.run(
-                    [TMUX_BIN, "paste-buffer", "-t", session],
-                    capture_output=True
-                )
+        # One write to the control-mode pipe instead of a tmux fork+exec
+        # per keystroke
+        _tmux("send-keys", "-t", session, key)
+        self._send_json({"ok": True})
+
+    def _post_send_text(self, name):
+        """API: send text (paste) via tmux."""
+        session = f"claude-{name}"
+        data = self._read_json_body()
+        if data is None:
+            return
+        text = data.get("text", "")
 
-            self._send_json({"ok": True})
+        if not text or len(text) > 10000:
+            self._send_json({"error": "invalid text"}, 400)
             return
 
-        # API: scroll via tmux copy-mode
-        if path.startswith("/api/scroll/"):
-            name = path.split("/api/scroll/")[1].strip("/")
-            session = f"claude-{name}"
-            content_length = int(self.headers.get("Content-Length", 0))
-            body = self.rfile.read(content_length)
-            data = json.loads(body)
-            direction = data.get("direction", "")
-
-            if direction not in ("up", "down"):
-                self._send_json({"error": "invalid direction"}, 400)
-                return
+        # load-buffer stays a one-shot subprocess: the pasted text is
+        # piped over stdin, which the line-framed control-mode command
+        # stream cannot carry safely (embedded newlines)
+        proc = subprocess.run(
+            [TMUX_BIN, "load-buffer", "-"],
+            input=text, text=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            close_fds=False
+        )
+        if proc.returncode == 0:
+            _tmux("paste-buffer", "-t", session)
 
-            subprocess.run(
-                [TMUX_BIN, "copy-mode", "-t", session],
-                capture_output=True
-            )
-            key = "PageUp" if direction == "up" else "PageDown"
-            subprocess.run(
-                [TMUX_BIN, "send-keys", "-t", session, key],
-                capture_output=True
-            )
+        self._send_json({"ok": True})
 
-            self._send_json({"ok": True})
+    def _post_scroll(self, name):
+        """API: scroll via tmux copy-mode."""
+        session = f"claude-{name}"
+        data = self._read_json_body()
+        if data is None:
             return
+        direction = data.get("direction", "")
 
-        self.send_response(404)
-        self.end_headers()
+        if direction not in ("up", "down"):
+            self._send_json({"error": "invalid direction"}, 400)
+            return
+
+        _tmux("copy-mode", "-t", session)
+        key = "PageUp" if direction == "up" else "PageDown"
+        _tmux("send-keys", "-t", session, key)
+
+        self._send_json({"ok": True})
 
     def log_message(self, format, *args):
         pass
 
 
+# Route tables: one dict lookup (exact paths) or one precompiled match
+# (paths carrying a session name) per request, instead of testing every
+# startswith prefix in order. Built once at import.
+_GET_EXACT = {
+    "/api/sessions": HubHandler._get_api_sessions,
+    "/api/capturable": HubHandler._get_api_capturable,
+    "/api/events": HubHandler._get_api_events,
+    "/api/folders": HubHandler._get_api_folders,
+    "/capture": HubHandler._get_capture,
+    "/cert": HubHandler._get_cert,
+    "/icon.png": HubHandler._get_icon,
+}
+
+_GET_ROUTES = [
+    (re.compile(r"^/start/(?P<name>.*)$"), HubHandler._get_start),
+    (re.compile(r"^/terminal/(?P<name>.*)$"), HubHandler._get_terminal),
+    (re.compile(r"^/stop/(?P<name>.*)$"), HubHandler._get_stop),
+    (re.compile(r"^/api/ttyd-ready/(?P<name>.*)$"), HubHandler._get_ttyd_ready),
+    (re.compile(r"^/api/ttyd-wait/(?P<name>.*)$"), HubHandler._get_ttyd_wait),
+]
+
+_POST_ROUTES = [
+    (re.compile(r"^/api/send-keys/(?P<name>.*)$"), HubHandler._post_send_keys),
+    (re.compile(r"^/api/send-text/(?P<name>.*)$"), HubHandler._post_send_text),
+    (re.compile(r"^/api/scroll/(?P<name>.*)$"), HubHandler._post_scroll),
+]
+
+
 # ─── CLI ─────────────────────────────────────────────────────────────────────
 
+def _find_hub_pid_proc() -> Optional[int]:
+    """Resolve the hub's PID from /proc without forking lsof (Linux).
+
+    Find the socket inode listening on HUB_PORT in /proc/net/tcp(6), then
+    scan /proc/*/fd for the process holding it — O(open sockets + fds of
+    live processes) instead of lsof's walk over every fd on the machine.
+    """
+    targets: set[str] = set()
+    for path in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(path, "r") as f:
+                next(f)  # skip header
+                for line in f:
+                    parts = line.split()
+                    # Column 3 is the connection state; 0A = LISTEN
+                    if len(parts) < 10 or parts[3] != "0A":
+                        continue
+                    if int(parts[1].rsplit(":", 1)[-1], 16) == HUB_PORT:
+                        targets.add(f"socket:[{parts[9]}]")
+        except (StopIteration, FileNotFoundError, PermissionError, OSError, ValueError):
+            continue
+    if not targets:
+        return None
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        fd_dir = f"/proc/{pid}/fd"
+        try:
+            for fd in os.listdir(fd_dir):
+                if os.readlink(os.path.join(fd_dir, fd)) in targets:
+                    return int(pid)
+        except OSError:
+            continue
+    return None
+
+
 def find_hub_pid() -> Optional[int]:
     """Find the PID of a running Claude Remote Hub server on HUB_PORT."""
+    if PLATFORM == "linux":
+        pid = _find_hub_pid_proc()
+        if pid is not None:
+            return pid
+
     lsof = shutil.which("lsof")
     if lsof:
         try:
             out = subprocess.check_output(
-                [lsof, "-ti", f":{HUB_PORT}"], text=True, stderr=subprocess.DEVNULL
+                [lsof, "-ti", f":{HUB_PORT}"], text=True,
+                stderr=subprocess.DEVNULL, close_fds=False
             ).strip()
             if out:
                 return int(out.split("\n")[0])
@@ -900,7 +1689,7 @@ def find_hub_pid() -> Optional[int]:
         try:
             out = subprocess.check_output(
                 [ss, "-tlnpH", f"sport = :{HUB_PORT}"],
-                text=True, stderr=subprocess.DEVNULL
+                text=True, stderr=subprocess.DEVNULL, close_fds=False
             ).strip()
             for line in out.split("\n"):
                 if "pid=" in line:
@@ -922,7 +1711,9 @@ def cmd_stop():
         print("  Claude Remote Hub is not running")
     pkill = shutil.which("pkill")
     if pkill:
-        subprocess.run([pkill, "-f", "ttyd.*-p 77"], capture_output=True)
+        subprocess.run([pkill, "-f", "ttyd.*-p 77"],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       close_fds=False)
 
 
 def cmd_status():
@@ -952,21 +1743,22 @@ def cmd_start():
 
     def cleanup(sig, frame):
         print("\n  Stopping Claude Remote Hub...")
-        sessions = get_sessions()
         pkill = shutil.which("pkill")
-        for s in sessions:
-            port = s["port"]
-            if pkill:
-                subprocess.run([pkill, "-f", f"ttyd.*-p {port}"], capture_output=True)
+        if pkill:
+            subprocess.run([pkill, "-f", "ttyd.*-p 77"],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           close_fds=False)
+        _tmux_ctrl.close()
+        subprocess.run([TMUX_BIN, "kill-session", "-t", _TmuxControl.CTRL_SESSION],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       close_fds=False)
         sys.exit(0)
 
     signal.signal(signal.SIGINT, cleanup)
     signal.signal(signal.SIGTERM, cleanup)
 
     proto = "http"
-    cert_file = os.path.join(INSTALL_DIR, "hub.crt")
-    key_file = os.path.join(INSTALL_DIR, "hub.key")
-    has_ssl = os.path.exists(cert_file) and os.path.exists(key_file)
+    has_ssl = os.path.exists(CERT_FILE) and os.path.exists(KEY_FILE)
     if has_ssl:
         proto = "https"
 
@@ -986,15 +1778,37 @@ def cmd_start():
     class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
         daemon_threads = True
 
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # Bounded pool: handlers mostly wait on subprocesses/sockets.
+            # Sized for a phone browser's ~6 connections plus the long-held
+            # /api/ttyd-wait and /api/events streams, with headroom for a
+            # second client; idle keep-alives are reaped by HubHandler.timeout
+            self._pool = ThreadPoolExecutor(max_workers=24,
+                                            thread_name_prefix="hub")
+
+        def process_request(self, request, client_address):
+            # Disable Nagle: keystroke-sized responses should not sit in
+            # the kernel for up to 40 ms waiting for an ACK
+            try:
+                request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
+            self._pool.submit(self.process_request_thread,
+                              request, client_address)
+
     server = ThreadedHTTPServer(("0.0.0.0", HUB_PORT), HubHandler)
 
     if has_ssl:
         import ssl
         ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-        ctx.load_cert_chain(cert_file, key_file)
+        ctx.load_cert_chain(CERT_FILE, KEY_FILE)
         ctx.minimum_version = ssl.TLSVersion.TLSv1_2
         ctx.set_ciphers("ECDHE+AESGCM:ECDHE+CHACHA20:!aNULL:!MD5")
         ctx.options |= ssl.OP_NO_COMPRESSION | ssl.OP_CIPHER_SERVER_PREFERENCE
+        # Session tickets let Safari's visibilitychange reconnect resume the
+        # TLS session instead of doing a full handshake
+        ctx.options &= ~ssl.OP_NO_TICKET
         server.socket = ctx.wrap_socket(server.socket, server_side=True)
 
     server.serve_forever()